@@ -7,21 +7,29 @@
  * - Auto-expires after 30 minutes of inactivity
  */
 
-import { createClient } from '@supabase/supabase-js';
-
 const SUPABASE_URL = process.env.SUPABASE_URL;
 const SUPABASE_KEY = process.env.SUPABASE_ANON_KEY;
 
-let supabase = null;
+let supabasePromise = null;
 
 /**
  * Initialize Supabase client
+ * The SDK is imported lazily so servers without Supabase configured never load it.
+ * The promise is cached so concurrent first calls share a single client.
  */
 function getSupabaseClient() {
-  if (!supabase && SUPABASE_URL && SUPABASE_KEY) {
-    supabase = createClient(SUPABASE_URL, SUPABASE_KEY);
+  if (!SUPABASE_URL || !SUPABASE_KEY) {
+    return Promise.resolve(null);
+  }
+  if (!supabasePromise) {
+    supabasePromise = import('@supabase/supabase-js')
+      .then(({ createClient }) => createClient(SUPABASE_URL, SUPABASE_KEY))
+      .catch(error => {
+        supabasePromise = null; // Allow a retry on the next call
+        throw error;
+      });
   }
-  return supabase;
+  return supabasePromise;
 }
 
 /**
@@ -43,7 +51,7 @@ export async function getConversation(conversationId) {
   }
 
   try {
-    const client = getSupabaseClient();
+    const client = await getSupabaseClient();
     
     const { data, error } = await client
       .from('conversations')
@@ -85,7 +93,7 @@ export async function saveConversation(conversationId, ticker, messages) {
   }
 
   try {
-    const client = getSupabaseClient();
+    const client = await getSupabaseClient();
     
     // Keep only last 10 messages to avoid token bloat
     const trimmedMessages = messages.slice(-10);
@@ -151,7 +159,7 @@ export async function cleanupOldConversations() {
   }
 
   try {
-    const client = getSupabaseClient();
+    const client = await getSupabaseClient();
     const thirtyMinutesAgo = new Date(Date.now() - 30 * 60 * 1000).toISOString();
     
     const { data, error } = await client
@@ -188,7 +196,7 @@ export async function getConversationStats() {
   }
 
   try {
-    const client = getSupabaseClient();
+    const client = await getSupabaseClient();
     
     // Total conversations
     const { count: total } = await client
@@ -7,21 +7,29 @@
  * - Enables time-series charting and trend analysis
  */
 
-import { createClient } from '@supabase/supabase-js';
-
 const SUPABASE_URL = process.env.SUPABASE_URL;
 const SUPABASE_KEY = process.env.SUPABASE_ANON_KEY;
 
-let supabase = null;
+let supabasePromise = null;
 
 /**
  * Initialize Supabase client
+ * The SDK is imported lazily so servers without Supabase configured never load it.
+ * The promise is cached so concurrent first calls share a single client.
  */
 function getSupabaseClient() {
-  if (!supabase && SUPABASE_URL && SUPABASE_KEY) {
-    supabase = createClient(SUPABASE_URL, SUPABASE_KEY);
+  if (!SUPABASE_URL || !SUPABASE_KEY) {
+    return Promise.resolve(null);
+  }
+  if (!supabasePromise) {
+    supabasePromise = import('@supabase/supabase-js')
+      .then(({ createClient }) => createClient(SUPABASE_URL, SUPABASE_KEY))
+      .catch(error => {
+        supabasePromise = null; // Allow a retry on the next call
+        throw error;
+      });
   }
-  return supabase;
+  return supabasePromise;
 }
 
 /**
@@ -78,7 +86,7 @@ export async function logMetricsSnapshot({
   }
 
   try {
-    const client = getSupabaseClient();
+    const client = await getSupabaseClient();
     
     // Determine data freshness
     let dataFreshness = 'unavailable';
@@ -201,7 +209,7 @@ export async function getMetricsHistory(ticker, days = 30) {
   }
 
   try {
-    const client = getSupabaseClient();
+    const client = await getSupabaseClient();
     
     const { data, error } = await client
       .from('metrics_history')
@@ -234,7 +242,7 @@ export async function getMetricsByDate(date) {
   }
 
   try {
-    const client = getSupabaseClient();
+    const client = await getSupabaseClient();
     
     const { data, error } = await client
       .from('metrics_history')
@@ -265,7 +273,7 @@ export async function getMetricsStats() {
   }
 
   try {
-    const client = getSupabaseClient();
+    const client = await getSupabaseClient();
     
     // Total snapshots
     const { count } = await client
@@ -4,15 +4,23 @@
  * No Python bridge needed - pure Node.js
  */
 
+import https from 'https';
 import fetch from 'node-fetch';
 
 // Read API key inside functions to avoid hoisting issues with ES modules
 const POLYGON_BASE_URL = 'https://api.polygon.io';
 
+// Keep-alive agent so the price, snapshot and pagination requests reuse one TLS connection
+const polygonAgent = new https.Agent({ keepAlive: true, maxSockets: 8 });
+
 // In-memory cache (same as yfinance provider)
 const optionsCache = new Map();
 const OPT_CACHE_TTL_SEC = parseInt(process.env.OPT_CACHE_TTL_SEC || '14400'); // 4 hours
 const OPT_STALE_TTL_SEC = parseInt(process.env.OPT_STALE_TTL_SEC || '86400'); // 24 hours
+const OPT_MAX_DAYS = 30; // Only options expiring within this many days are used
+
+// In-flight fetches per cache key, so concurrent misses (cache warmer + /analyze) share one request
+const inflightFetches = new Map();
 
 /**
  * Fetch options data from Polygon.io
@@ -40,35 +48,48 @@ export async function fetchPolygonOptions(symbol) {
     return cached.data;
   }
 
+  // Join an in-flight fetch for the same symbol instead of hitting Polygon twice
+  if (inflightFetches.has(cacheKey)) {
+    console.log(`[${new Date().toISOString()}] ⏳ Joining in-flight Polygon fetch for ${symbol}`);
+  }
+  return coalesceInflight(cacheKey, () => fetchFreshPolygonOptions(symbol, POLYGON_API_KEY, cacheKey, cached, now));
+}
+
+/**
+ * Share one in-flight fetch per cache key; the entry is cleared once it settles
+ * @template T
+ * @param {string} cacheKey - Cache key the fetch populates
+ * @param {() => Promise<T>} startFetch - Starts the fetch when none is in flight
+ * @returns {Promise<T>}
+ */
+export function coalesceInflight(cacheKey, startFetch) {
+  const inflight = inflightFetches.get(cacheKey);
+  if (inflight) return inflight;
+
+  const request = startFetch().finally(() => inflightFetches.delete(cacheKey));
+  inflightFetches.set(cacheKey, request);
+  return request;
+}
+
+/**
+ * Fetch fresh options data from Polygon.io and cache it, falling back to stale cache on failure
+ */
+async function fetchFreshPolygonOptions(symbol, apiKey, cacheKey, cached, now) {
   // Try to fetch fresh data
   try {
     console.log(`[${new Date().toISOString()}] 🔍 Fetching fresh Polygon options for ${symbol}...`);
     
-    // Step 1: Get current stock price
-    const priceUrl = `${POLYGON_BASE_URL}/v2/aggs/ticker/${symbol}/prev?adjusted=true&apiKey=${POLYGON_API_KEY}`;
-    const priceResp = await fetch(priceUrl, { timeout: 10000 });
-    
-    if (!priceResp.ok) {
-      console.log(`[${new Date().toISOString()}] ⚠️  Polygon price fetch failed: ${priceResp.status} ${priceResp.statusText}`);
-      return useStaleOrEmpty(cacheKey, cached, now, symbol);
-    }
-    
-    const priceData = await priceResp.json();
-    const spot = priceData.results?.[0]?.c || null;
-    
-    if (!spot) {
-      console.log(`[${new Date().toISOString()}] ⚠️  No spot price from Polygon for ${symbol}: ${JSON.stringify(priceData)}`);
-      return useStaleOrEmpty(cacheKey, cached, now, symbol);
-    }
-
-    console.log(`[${new Date().toISOString()}] 📊 Got spot price for ${symbol}: $${spot}`);
-
-    // Step 2: Get options snapshot with Greeks, IV, and OI (requires paid tier)
-    // Request up to 250 contracts per page to ensure we get ATM contracts
-    const snapshotUrl = `${POLYGON_BASE_URL}/v3/snapshot/options/${symbol}?limit=250&apiKey=${POLYGON_API_KEY}`;
+    // Step 1: Get options snapshot with Greeks, IV, and OI (requires paid tier)
+    // Request up to 250 contracts per page to ensure we get ATM contracts, and only
+    // expirations inside the OPT_MAX_DAYS window so pages aren't spent on far-dated contracts.
+    // Start at tomorrow (UTC): processPolygonOptions drops today's expiry (ttmDays <= 0), and
+    // snapshot results are ticker-ordered, so same-day contracts would otherwise fill the first pages
+    const minExpiry = new Date(now + 24 * 60 * 60 * 1000).toISOString().split('T')[0];
+    const maxExpiry = new Date(now + OPT_MAX_DAYS * 24 * 60 * 60 * 1000).toISOString().split('T')[0];
+    const snapshotUrl = `${POLYGON_BASE_URL}/v3/snapshot/options/${symbol}?expiration_date.gte=${minExpiry}&expiration_date.lte=${maxExpiry}&limit=250&apiKey=${apiKey}`;
     console.log(`[${new Date().toISOString()}] 🔍 Fetching options snapshot for ${symbol}...`);
     
-    const optionsResp = await fetch(snapshotUrl, { timeout: 15000 });
+    const optionsResp = await fetch(snapshotUrl, { timeout: 15000, agent: polygonAgent });
     
     if (!optionsResp.ok) {
       console.log(`[${new Date().toISOString()}] ⚠️  Polygon options fetch failed: ${optionsResp.status} ${optionsResp.statusText}`);
@@ -82,7 +103,7 @@ export async function fetchPolygonOptions(symbol) {
     let pageCount = 1;
     while (optionsData.next_url && pageCount < 3) {
       console.log(`[${new Date().toISOString()}] 📊 Fetching page ${pageCount + 1}...`);
-      const nextResp = await fetch(optionsData.next_url + `&apiKey=${POLYGON_API_KEY}`, { timeout: 15000 });
+      const nextResp = await fetch(optionsData.next_url + `&apiKey=${apiKey}`, { timeout: 15000, agent: polygonAgent });
       if (nextResp.ok) {
         optionsData = await nextResp.json();
         allContracts = allContracts.concat(optionsData.results || []);
@@ -99,6 +120,33 @@ export async function fetchPolygonOptions(symbol) {
 
     console.log(`[${new Date().toISOString()}] 📊 Got ${allContracts.length} option contracts from Polygon across ${pageCount} pages`);
 
+    // Step 2: Get current stock price
+    // The snapshot already carries the underlying price on each contract; only fall
+    // back to a separate previous-close request when it is missing
+    let spot = allContracts.find(c => c.underlying_asset?.price > 0)?.underlying_asset.price || null;
+    
+    if (spot) {
+      console.log(`[${new Date().toISOString()}] 📊 Got spot price for ${symbol} from snapshot: $${spot}`);
+    } else {
+      const priceUrl = `${POLYGON_BASE_URL}/v2/aggs/ticker/${symbol}/prev?adjusted=true&apiKey=${apiKey}`;
+      const priceResp = await fetch(priceUrl, { timeout: 10000, agent: polygonAgent });
+      
+      if (!priceResp.ok) {
+        console.log(`[${new Date().toISOString()}] ⚠️  Polygon price fetch failed: ${priceResp.status} ${priceResp.statusText}`);
+        return useStaleOrEmpty(cacheKey, cached, now, symbol);
+      }
+      
+      const priceData = await priceResp.json();
+      spot = priceData.results?.[0]?.c || null;
+      
+      if (!spot) {
+        console.log(`[${new Date().toISOString()}] ⚠️  No spot price from Polygon for ${symbol}: ${JSON.stringify(priceData)}`);
+        return useStaleOrEmpty(cacheKey, cached, now, symbol);
+      }
+
+      console.log(`[${new Date().toISOString()}] 📊 Got spot price for ${symbol}: $${spot}`);
+    }
+
     // Step 3: Process options data
     const rows = processPolygonOptions(allContracts, spot);
     
@@ -223,43 +271,44 @@ function useStaleOrEmpty(cacheKey, cached, now, symbol) {
 function processPolygonOptions(results, spot) {
   const rows = [];
   const now = Date.now();
-  const maxDays = 30;
+  // Chains share a handful of expiration dates, so parse each one once
+  const expiryInfo = new Map();
 
   for (const opt of results) {
-    try {
-      const details = opt.details;
-      if (!details || !details.expiration_date) continue;
-
+    // Skip malformed options - cheap numeric checks run before any date parsing
+    // Note: implied_volatility is a top-level field in Polygon API, not in greeks
+    const details = opt?.details;
+    if (!details || !details.expiration_date) continue;
+    if (!(opt.implied_volatility > 0)) continue;
+    if (!(details.strike_price > 0)) continue;
+
+    let expiry = expiryInfo.get(details.expiration_date);
+    if (!expiry) {
       const expiryDate = new Date(details.expiration_date);
       const ttmDays = (expiryDate - now) / (1000 * 60 * 60 * 24);
-
-      // Only include options within 30 days
-      if (ttmDays <= 0 || ttmDays > maxDays) continue;
-
-      const greeks = opt.greeks || {};
-      const lastQuote = opt.last_quote || {};
-
-      // Filter: need implied volatility and basic data
-      // Note: implied_volatility is a top-level field in Polygon API, not in greeks
-      if (!opt.implied_volatility || opt.implied_volatility <= 0) continue;
-      if (!details.strike_price || details.strike_price <= 0) continue;
-
-      rows.push({
-        expiryUTC: expiryDate.toISOString(),
-        ttmDays: Math.round(ttmDays * 100) / 100,
-        strike: Math.round(details.strike_price * 100) / 100,
-        type: details.contract_type === 'call' ? 'call' : 'put',
-        iv: Math.round(opt.implied_volatility * 10000) / 10000,
-        oi: opt.open_interest || 0,
-        volume: opt.day?.volume || 0,
-        bid: lastQuote.bid || 0,
-        ask: lastQuote.ask || 0,
-        lastPrice: opt.day?.close || 0
-      });
-    } catch (err) {
-      // Skip malformed options
-      continue;
+      // Only include options within 30 days (NaN from a bad date fails both checks)
+      expiry = ttmDays > 0 && ttmDays <= OPT_MAX_DAYS
+        ? { valid: true, expiryUTC: expiryDate.toISOString(), ttmDays: Math.round(ttmDays * 100) / 100 }
+        : { valid: false };
+      expiryInfo.set(details.expiration_date, expiry);
     }
+    if (!expiry.valid) continue;
+
+    const day = opt.day || {};
+    const lastQuote = opt.last_quote || {};
+
+    rows.push({
+      expiryUTC: expiry.expiryUTC,
+      ttmDays: expiry.ttmDays,
+      strike: Math.round(details.strike_price * 100) / 100,
+      type: details.contract_type === 'call' ? 'call' : 'put',
+      iv: Math.round(opt.implied_volatility * 10000) / 10000,
+      oi: opt.open_interest || 0,
+      volume: day.volume || 0,
+      bid: lastQuote.bid || 0,
+      ask: lastQuote.ask || 0,
+      lastPrice: day.close || 0
+    });
   }
 
   return rows;
@@ -317,8 +366,19 @@ function calculateMetrics(rows, spot) {
     };
   }
 
+  // Group rows by expiry once; the metrics below index into these groups instead of re-filtering rows
+  const rowsByExpiry = new Map();
+  for (const row of rows) {
+    const expiryGroup = rowsByExpiry.get(row.expiryUTC);
+    if (expiryGroup) {
+      expiryGroup.push(row);
+    } else {
+      rowsByExpiry.set(row.expiryUTC, [row]);
+    }
+  }
+
   // Find nearest expiry
-  const expiries = [...new Set(rows.map(r => r.expiryUTC))].sort();
+  const expiries = [...rowsByExpiry.keys()].sort();
   if (expiries.length === 0) {
     return { 
       atmIV: null, 
@@ -337,17 +397,31 @@ function calculateMetrics(rows, spot) {
   }
 
   const nearestExpiry = expiries[0];
-  const expiryRows = rows.filter(r => r.expiryUTC === nearestExpiry);
+  const expiryRows = rowsByExpiry.get(nearestExpiry);
 
   // 1. ATM IV
   let atmIV = null;
-  const strikes = [...new Set(expiryRows.map(r => r.strike))].sort((a, b) => a - b);
-  const atmStrike = strikes.reduce((prev, curr) => 
-    Math.abs(curr - spot) < Math.abs(prev - spot) ? curr : prev
-  );
-
-  const atmCall = expiryRows.find(r => r.strike === atmStrike && r.type === 'call');
-  const atmPut = expiryRows.find(r => r.strike === atmStrike && r.type === 'put');
+  // Nearest strike to spot and its first call/put in one pass (ties go to the lower strike)
+  let atmStrike = expiryRows[0].strike;
+  let atmDistance = Math.abs(atmStrike - spot);
+  let atmCall = null;
+  let atmPut = null;
+  for (const row of expiryRows) {
+    const distance = Math.abs(row.strike - spot);
+    if (distance < atmDistance || (distance === atmDistance && row.strike < atmStrike)) {
+      atmStrike = row.strike;
+      atmDistance = distance;
+      atmCall = null;
+      atmPut = null;
+    }
+    if (row.strike === atmStrike) {
+      if (row.type === 'call') {
+        if (!atmCall) atmCall = row;
+      } else if (!atmPut) {
+        atmPut = row;
+      }
+    }
+  }
 
   if (atmCall && atmPut) {
     const avgIV = (atmCall.iv + atmPut.iv) / 2;
@@ -370,10 +444,23 @@ function calculateMetrics(rows, spot) {
     };
   }
 
+  // Call/put volume and OI totals for the nearest expiry, aggregated in one pass
+  let totalCallVol = 0;
+  let totalPutVol = 0;
+  let totalCallOI = 0;
+  let totalPutOI = 0;
+  for (const row of expiryRows) {
+    if (row.type === 'call') {
+      totalCallVol += row.volume;
+      totalCallOI += row.oi;
+    } else {
+      totalPutVol += row.volume;
+      totalPutOI += row.oi;
+    }
+  }
+
   // 2. Put/Call Volume Ratio
   let putCallVolumeRatio = null;
-  const totalCallVol = expiryRows.filter(r => r.type === 'call').reduce((sum, r) => sum + r.volume, 0);
-  const totalPutVol = expiryRows.filter(r => r.type === 'put').reduce((sum, r) => sum + r.volume, 0);
 
   if (totalCallVol > 0) {
     putCallVolumeRatio = {
@@ -400,9 +487,6 @@ function calculateMetrics(rows, spot) {
 
   // 4. Call/Put OI Ratio (positioning vs flow)
   let putCallOIRatio = null;
-  const totalCallOI = expiryRows.filter(r => r.type === 'call').reduce((sum, r) => sum + r.oi, 0);
-  const totalPutOI = expiryRows.filter(r => r.type === 'put').reduce((sum, r) => sum + r.oi, 0);
-  
   if (totalCallOI > 0) {
     putCallOIRatio = {
       ratio: Math.round((totalPutOI / totalCallOI) * 100) / 100,
@@ -445,10 +529,13 @@ function calculateMetrics(rows, spot) {
   let totalDelta = null;
   let netDelta = 0;
   const now = Date.now();
+  // Time to expiry is loop-invariant per expiry - compute it once instead of per row
+  const ttmYearsByExpiry = new Map(
+    expiries.map(expiry => [expiry, (new Date(expiry) - now) / (1000 * 60 * 60 * 24 * 365.25)])
+  );
   
   for (const row of rows.filter(r => r.oi > 0)) {
-    const expiryDate = new Date(row.expiryUTC);
-    const ttmYears = (expiryDate - now) / (1000 * 60 * 60 * 24 * 365.25);
+    const ttmYears = ttmYearsByExpiry.get(row.expiryUTC);
     
     if (ttmYears > 0) {
       const delta = calculateDelta(spot, row.strike, ttmYears, row.iv, row.type === 'call');
@@ -470,8 +557,7 @@ function calculateMetrics(rows, spot) {
     if (!gammaByStrike[row.strike]) {
       gammaByStrike[row.strike] = 0;
     }
-    const expiryDate = new Date(row.expiryUTC);
-    const ttmYears = (expiryDate - now) / (1000 * 60 * 60 * 24 * 365.25);
+    const ttmYears = ttmYearsByExpiry.get(row.expiryUTC);
     
     if (ttmYears > 0 && row.iv > 0) {
       const d1 = (Math.log(spot / row.strike) + (0.5 * row.iv * row.iv) * ttmYears) / (row.iv * Math.sqrt(ttmYears));
@@ -500,8 +586,8 @@ function calculateMetrics(rows, spot) {
     const nearExpiry = expiries[0];
     const farExpiry = expiries[expiries.length - 1];
     
-    const nearRows = rows.filter(r => r.expiryUTC === nearExpiry && r.oi > 0);
-    const farRows = rows.filter(r => r.expiryUTC === farExpiry && r.oi > 0);
+    const nearRows = rowsByExpiry.get(nearExpiry).filter(r => r.oi > 0);
+    const farRows = rowsByExpiry.get(farExpiry).filter(r => r.oi > 0);
     
     if (nearRows.length > 0 && farRows.length > 0) {
       const nearIV = nearRows.reduce((sum, r) => sum + r.iv * r.oi, 0) / nearRows.reduce((sum, r) => sum + r.oi, 0);
@@ -518,7 +604,9 @@ function calculateMetrics(rows, spot) {
 
   // 9. Zero Gamma Level (where net gamma = 0)
   let zeroGammaLevel = null;
-  const testStrikes = strikes.filter(s => s > spot * 0.9 && s < spot * 1.1);
+  const testStrikes = [...new Set(expiryRows.map(r => r.strike))]
+    .filter(s => s > spot * 0.9 && s < spot * 1.1)
+    .sort((a, b) => a - b);
   
   if (testStrikes.length >= 2) {
     let closestStrike = testStrikes[0];
@@ -528,8 +616,7 @@ function calculateMetrics(rows, spot) {
       let netGamma = 0;
       
       for (const row of expiryRows) {
-        const expiryDate = new Date(row.expiryUTC);
-        const ttmYears = (expiryDate - now) / (1000 * 60 * 60 * 24 * 365.25);
+        const ttmYears = ttmYearsByExpiry.get(row.expiryUTC);
         
         if (ttmYears > 0 && row.iv > 0) {
           const d1 = (Math.log(testStrike / row.strike) + (0.5 * row.iv * row.iv) * ttmYears) / (row.iv * Math.sqrt(ttmYears));
@@ -563,7 +650,7 @@ function calculateMetrics(rows, spot) {
       const daysToExpiry = Math.round((expiryDate - now) / (1000 * 60 * 60 * 24));
       
       if (ttmYears > 0) {
-        const expiryRows = rows.filter(r => r.expiryUTC === expiry && r.oi > 0 && r.iv > 0);
+        const expiryRows = rowsByExpiry.get(expiry).filter(r => r.oi > 0 && r.iv > 0);
         const atmRows = expiryRows.filter(r => Math.abs(r.strike - spot) < spot * 0.05);
         
         if (atmRows.length > 0) {
@@ -595,8 +682,7 @@ function calculateMetrics(rows, spot) {
   let netVega = 0;
   
   for (const row of rows.filter(r => r.oi > 0)) {
-    const expiryDate = new Date(row.expiryUTC);
-    const ttmYears = (expiryDate - now) / (1000 * 60 * 60 * 24 * 365.25);
+    const ttmYears = ttmYearsByExpiry.get(row.expiryUTC);
     
     if (ttmYears > 0 && row.iv > 0) {
       const vega = calculateVega(spot, row.strike, ttmYears, row.iv);
@@ -615,8 +701,7 @@ function calculateMetrics(rows, spot) {
   let netVanna = 0;
   
   for (const row of rows.filter(r => r.oi > 0)) {
-    const expiryDate = new Date(row.expiryUTC);
-    const ttmYears = (expiryDate - now) / (1000 * 60 * 60 * 24 * 365.25);
+    const ttmYears = ttmYearsByExpiry.get(row.expiryUTC);
     
     if (ttmYears > 0 && row.iv > 0) {
       const vannaValue = calculateVanna(spot, row.strike, ttmYears, row.iv);
@@ -418,7 +418,7 @@ router.get('/blocks', async (req, res) => {
     // SAFETY NET: Ensure all image URLs use HTTPS before sending response
     blocks = ensureHttpsInBlocks(blocks);
     
-    // Generate ETag
+    // Serialize once: the same string is hashed for the ETag and sent as the body
     const content = JSON.stringify(blocks);
     const etag = generateETag(content);
     
@@ -436,7 +436,7 @@ router.get('/blocks', async (req, res) => {
       'Content-Type': 'application/json'
     });
     
-    res.json(blocks);
+    res.send(content);
     
   } catch (error) {
     console.error(`[${getCurrentTimeISO()}] ❌ /news/blocks error: ${error instanceof Error ? error.message : 'Unknown error'}`);
@@ -568,7 +568,7 @@ router.get('/:symbol', async (req, res) => {
       response.note = note;
     }
     
-    // Generate ETag
+    // Serialize once: the same string is hashed for the ETag and sent as the body
     const content = JSON.stringify(response);
     const etag = generateETag(content);
     
@@ -586,7 +586,7 @@ router.get('/:symbol', async (req, res) => {
       'Content-Type': 'application/json'
     });
     
-    res.json(response);
+    res.send(content);
     
   } catch (error) {
     console.error(`[${getCurrentTimeISO()}] ❌ /news/:symbol error: ${error instanceof Error ? error.message : 'Unknown error'}`);
@@ -4,6 +4,7 @@ dotenv.config();
 
 import express from 'express';
 import cors from 'cors';
+import https from 'https';
 import fetch from 'node-fetch';
 import { fetchOptions, getOptionsProvider } from './lib/optionsProvider.js';
 import { initCacheWarmer } from './lib/cacheWarmer.js';
@@ -51,6 +52,15 @@ const FINNHUB_API_KEY = process.env.FINNHUB_API_KEY;
 const ALPACA_API_KEY = process.env.ALPACA_API_KEY;
 const ALPACA_SECRET_KEY = process.env.ALPACA_SECRET_KEY;
 const ALPACA_BASE_URL = process.env.ALPACA_BASE_URL || 'https://paper-api.alpaca.markets';
+const ALPACA_TIMEOUT_MS = 5000;
+
+// Keep-alive agent for Alpaca market data (quote + bars hit the same host on every request)
+const alpacaAgent = new https.Agent({ keepAlive: true, maxSockets: 8 });
+
+// Drain an unread response body so its keep-alive socket returns to the pool
+const discardBody = (response) => {
+  response.arrayBuffer().catch(() => {});
+};
 
 // Utility function to log with timestamp
 const log = (message) => {
@@ -259,47 +269,62 @@ const validateClaudeOutput = (output) => {
 
 // Fetch live price data from Alpaca
 const fetchAlpacaPrice = async (symbol) => {
-  try {
-    if (!ALPACA_API_KEY || !ALPACA_SECRET_KEY) {
-      log(`⚠️  Alpaca keys not configured, skipping price fetch`);
-      return null;
-    }
+  if (!ALPACA_API_KEY || !ALPACA_SECRET_KEY) {
+    log(`⚠️  Alpaca keys not configured, skipping price fetch`);
+    return null;
+  }
 
-    // Use data endpoint for market data (not trading endpoint)
-    const url = `https://data.alpaca.markets/v2/stocks/${symbol}/quotes/latest`;
-    
-    const response = await fetch(url, {
-      headers: {
-        'APCA-API-KEY-ID': ALPACA_API_KEY,
-        'APCA-API-SECRET-KEY': ALPACA_SECRET_KEY
-      }
-    });
+  // Use data endpoint for market data (not trading endpoint)
+  const url = `https://data.alpaca.markets/v2/stocks/${symbol}/quotes/latest`;
+  const barsUrl = `https://data.alpaca.markets/v2/stocks/${symbol}/bars?timeframe=1Day&limit=2`;
+  const requestOptions = () => ({
+    headers: {
+      'APCA-API-KEY-ID': ALPACA_API_KEY,
+      'APCA-API-SECRET-KEY': ALPACA_SECRET_KEY
+    },
+    signal: AbortSignal.timeout(ALPACA_TIMEOUT_MS),
+    agent: alpacaAgent
+  });
+
+  // Quote and previous-close bars are independent - start the bars request now so it
+  // runs concurrently with the quote. A failed/slow bars request must not sink the
+  // quote: fetch errors resolve to null and body errors fall back to the quote price.
+  const barsRequest = fetch(barsUrl, requestOptions()).catch(error => {
+    log(`⚠️  Alpaca bars fetch error for ${symbol}: ${error.message}`);
+    return null;
+  });
+  let barsHandled = false;
+
+  try {
+    const response = await fetch(url, requestOptions());
 
     if (!response.ok) {
       log(`⚠️  Alpaca API error for ${symbol}: HTTP ${response.status}`);
+      discardBody(response);
       return null;
     }
 
     const data = await response.json();
-    
+
     if (data.quote) {
       const currentPrice = data.quote.ap || data.quote.bp; // ask price or bid price
-      
+
       // Get previous close from bars endpoint
-      const barsUrl = `https://data.alpaca.markets/v2/stocks/${symbol}/bars?timeframe=1Day&limit=2`;
-      const barsResponse = await fetch(barsUrl, {
-        headers: {
-          'APCA-API-KEY-ID': ALPACA_API_KEY,
-          'APCA-API-SECRET-KEY': ALPACA_SECRET_KEY
-        }
-      });
-      
+      const barsResponse = await barsRequest;
+      barsHandled = true;
+
       let prevClose = currentPrice;
-      if (barsResponse.ok) {
-        const barsData = await barsResponse.json();
-        if (barsData.bars && barsData.bars.length > 0) {
-          prevClose = barsData.bars[0].c; // Previous day's close
+      if (barsResponse && barsResponse.ok) {
+        try {
+          const barsData = await barsResponse.json();
+          if (barsData.bars && barsData.bars.length > 0) {
+            prevClose = barsData.bars[0].c; // Previous day's close
+          }
+        } catch (error) {
+          log(`⚠️  Alpaca bars read error for ${symbol}: ${error.message}`);
         }
+      } else if (barsResponse) {
+        discardBody(barsResponse);
       }
       
       const change = currentPrice - prevClose;
@@ -320,6 +345,11 @@ const fetchAlpacaPrice = async (symbol) => {
   } catch (error) {
     log(`⚠️  Alpaca fetch error for ${symbol}: ${error.message}`);
     return null; // Fail gracefully
+  } finally {
+    // Quote failed or had no data: drain the unused bars body so its keep-alive socket is released
+    if (!barsHandled) {
+      barsRequest.then(barsResponse => barsResponse && discardBody(barsResponse));
+    }
   }
 };
 
@@ -460,44 +490,27 @@ const calculateDealerGamma = (optionsData, spotPrice) => {
   let totalGamma = 0;
   const strikeContributions = [];
 
-  // Process calls
-  for (const option of optionsData.calls) {
-    const expiration = option.expiration;
-    
-    if (!expiration || expiration > thirtyDaysFromNow) continue;
-
-    const T = (expiration - now) / (365.25 * 24 * 60 * 60);
-    const K = option.strike;
-    const IV = option.impliedVolatility;
-    const OI = option.openInterest;
-
-    if (IV <= 0 || OI <= 0 || T <= 0) continue;
-
-    const gamma = calculateGamma(spotPrice, K, T, IV);
-    const dollarGamma = gamma * spotPrice * spotPrice * 100 * OI;
-    
-    totalGamma += dollarGamma;
-    strikeContributions.push({ strike: K, gamma: dollarGamma, type: 'call' });
-  }
-
-  // Process puts
-  for (const option of optionsData.puts) {
-    const expiration = option.expiration;
-    
-    if (!expiration || expiration > thirtyDaysFromNow) continue;
+  // Process calls and puts through the same loop body, tagged by type
+  const optionsByType = [['call', optionsData.calls], ['put', optionsData.puts]];
+  for (const [type, options] of optionsByType) {
+    for (const option of options) {
+      const expiration = option.expiration;
+      
+      if (!expiration || expiration > thirtyDaysFromNow) continue;
 
-    const T = (expiration - now) / (365.25 * 24 * 60 * 60);
-    const K = option.strike;
-    const IV = option.impliedVolatility;
-    const OI = option.openInterest;
+      const T = (expiration - now) / (365.25 * 24 * 60 * 60);
+      const K = option.strike;
+      const IV = option.impliedVolatility;
+      const OI = option.openInterest;
 
-    if (IV <= 0 || OI <= 0 || T <= 0) continue;
+      if (IV <= 0 || OI <= 0 || T <= 0) continue;
 
-    const gamma = calculateGamma(spotPrice, K, T, IV);
-    const dollarGamma = gamma * spotPrice * spotPrice * 100 * OI;
-    
-    totalGamma += dollarGamma;
-    strikeContributions.push({ strike: K, gamma: dollarGamma, type: 'put' });
+      const gamma = calculateGamma(spotPrice, K, T, IV);
+      const dollarGamma = gamma * spotPrice * spotPrice * 100 * OI;
+      
+      totalGamma += dollarGamma;
+      strikeContributions.push({ strike: K, gamma: dollarGamma, type });
+    }
   }
 
   if (strikeContributions.length === 0) {
@@ -681,8 +694,16 @@ const calculateSkewFromRows = (rows, spotPrice) => {
     return lower.iv + weight * (upper.iv - lower.iv);
   };
 
-  const puts = rows.filter(r => r.type === 'put');
-  const calls = rows.filter(r => r.type === 'call');
+  // Split rows into puts and calls in one pass
+  const puts = [];
+  const calls = [];
+  for (const row of rows) {
+    if (row.type === 'put') {
+      puts.push(row);
+    } else if (row.type === 'call') {
+      calls.push(row);
+    }
+  }
 
   const putIV = findIV(puts, putStrike);
   const callIV = findIV(calls, callStrike);
@@ -1498,6 +1519,10 @@ Provide a clear, accurate explanation in 2-4 paragraphs. Use plain language but
     // Track data source timestamps for v2 sources
     const sourcesV2 = []; // V2 format: { type, provider, timestamp, status, freshness_seconds }
 
+    // Price (Alpaca) and options (Polygon) are independent - start the options
+    // fetch now so its latency overlaps the price fetch instead of following it
+    const optionsPromise = symbol ? fetchOptions(symbol) : null;
+
     // Task 2: Fetch live price data from Alpaca if symbol found
     let priceData = null;
     let spotPrice = null;
@@ -1519,7 +1544,7 @@ Provide a clear, accurate explanation in 2-4 paragraphs. Use plain language but
     // Task 3: Fetch options via yfinance bridge if symbol found
     let optionsData = { spot: null, rows: [], fetchedAt: null };
     if (symbol) {
-      optionsData = await fetchOptions(symbol);
+      optionsData = await optionsPromise;
       
       const hasOptionsData = optionsData.rows && optionsData.rows.length > 0;
       const isStale = optionsData.isStale || false;
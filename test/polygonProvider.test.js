@@ -0,0 +1,103 @@
+/**
+ * Unit tests for Polygon provider in-flight fetch coalescing
+ */
+
+import { strict as assert } from 'assert';
+import { coalesceInflight } from '../lib/polygonProvider.js';
+
+console.log('🧪 Running Polygon Provider Tests...\n');
+
+let passedTests = 0;
+let failedTests = 0;
+
+async function test(description, fn) {
+  try {
+    await fn();
+    console.log(`✅ ${description}`);
+    passedTests++;
+  } catch (error) {
+    console.error(`❌ ${description}`);
+    console.error(`   Error: ${error.message}`);
+    failedTests++;
+  }
+}
+
+// ==================== In-flight Coalescing Tests ====================
+
+await test('Concurrent misses for the same key share one fetch', async () => {
+  let fetchCount = 0;
+  const startFetch = async () => {
+    fetchCount++;
+    await new Promise(resolve => setTimeout(resolve, 10));
+    return { rows: [] };
+  };
+
+  const [first, second] = await Promise.all([
+    coalesceInflight('SPY:polygon', startFetch),
+    coalesceInflight('SPY:polygon', startFetch)
+  ]);
+
+  assert.equal(fetchCount, 1);
+  assert.equal(first, second);
+});
+
+await test('Different keys fetch independently', async () => {
+  let fetchCount = 0;
+  const startFetch = async () => {
+    fetchCount++;
+    return { rows: [] };
+  };
+
+  await Promise.all([
+    coalesceInflight('AAPL:polygon', startFetch),
+    coalesceInflight('MSFT:polygon', startFetch)
+  ]);
+
+  assert.equal(fetchCount, 2);
+});
+
+await test('Settled fetch is cleared so the next miss fetches again', async () => {
+  let fetchCount = 0;
+  const startFetch = async () => {
+    fetchCount++;
+    return { rows: [] };
+  };
+
+  await coalesceInflight('QQQ:polygon', startFetch);
+  await coalesceInflight('QQQ:polygon', startFetch);
+
+  assert.equal(fetchCount, 2);
+});
+
+await test('Failed fetch is cleared and rejects every waiter', async () => {
+  let fetchCount = 0;
+  const failingFetch = async () => {
+    fetchCount++;
+    throw new Error('boom');
+  };
+
+  const results = await Promise.allSettled([
+    coalesceInflight('TSLA:polygon', failingFetch),
+    coalesceInflight('TSLA:polygon', failingFetch)
+  ]);
+
+  assert.equal(fetchCount, 1);
+  assert.ok(results.every(r => r.status === 'rejected' && r.reason.message === 'boom'));
+
+  const retry = await coalesceInflight('TSLA:polygon', async () => {
+    fetchCount++;
+    return { rows: [] };
+  });
+
+  assert.equal(fetchCount, 2);
+  assert.deepEqual(retry, { rows: [] });
+});
+
+// ==================== Results Summary ====================
+console.log('\n' + '='.repeat(50));
+console.log(`📊 Test Results: ${passedTests} passed, ${failedTests} failed`);
+console.log('='.repeat(50));
+
+if (failedTests > 0) {
+  process.exit(1);
+}